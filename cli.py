@@ -12,9 +12,14 @@ Usage:
 """
 
 import argparse
+import json
+import logging
 import sys
 import os
 import time
+import traceback
+from dataclasses import is_dataclass
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -35,7 +40,7 @@ except ImportError:
     RICH_AVAILABLE = False
     print("Warning: 'rich' library not available. Install with: pip install rich")
 
-from deep_research import DeepResearcher, ResearchResult
+from deep_research import DeepResearcher, ResearchResult, safe_query_filename
 
 
 class DeepResearchCLI:
@@ -122,22 +127,28 @@ class DeepResearchCLI:
     
     def print_sources_tree(self, result: ResearchResult, max_sources: int = 10):
         """Print sources in a tree format"""
-        all_content = result.level_1_content + result.level_2_content
-        relevant_content = [c for c in all_content if c.success and c.relevance_score > 0.1]
-        relevant_content.sort(key=lambda x: x.relevance_score, reverse=True)
+        # Rank each level on its own rather than testing membership of every
+        # source against the level lists, which compares whole pages pairwise
+        def top_sources(contents):
+            relevant = [c for c in contents if c.success and c.relevance_score > 0.1]
+            relevant.sort(key=lambda x: x.relevance_score, reverse=True)
+            return relevant
         
-        if not relevant_content:
+        level1_relevant = top_sources(result.level_1_content)
+        level2_relevant = top_sources(result.level_2_content)
+        
+        if not level1_relevant and not level2_relevant:
             return
         
+        level1_sources = level1_relevant[:max_sources//2]
+        level2_sources = level2_relevant[:max_sources//2]
+        
         if self.console:
             tree = Tree("🔗 [bold blue]Top Sources[/bold blue]")
             
             level1_tree = tree.add("📋 Level 1 Sources (Direct Search Results)")
             level2_tree = tree.add("🔍 Level 2 Sources (Recursive Links)")
             
-            level1_sources = [c for c in relevant_content if c in result.level_1_content][:max_sources//2]
-            level2_sources = [c for c in relevant_content if c in result.level_2_content][:max_sources//2]
-            
             for source in level1_sources:
                 title = source.title or "Untitled"
                 if len(title) > 50:
@@ -172,7 +183,6 @@ class DeepResearchCLI:
         else:
             print("\n🔗 Top Sources:")
             print("\n📋 Level 1 Sources (Direct Search Results):")
-            level1_sources = [c for c in relevant_content if c in result.level_1_content][:max_sources//2]
             for i, source in enumerate(level1_sources, 1):
                 print(f"  {i}. {source.title or 'Untitled'} (Relevance: {source.relevance_score:.2f})")
                 print(f"     URL: {source.url}")
@@ -184,7 +194,6 @@ class DeepResearchCLI:
                 print()
             
             print("\n🔍 Level 2 Sources (Recursive Links):")
-            level2_sources = [c for c in relevant_content if c in result.level_2_content][:max_sources//2]
             for i, source in enumerate(level2_sources, 1):
                 print(f"  {i}. {source.title or 'Untitled'} (Relevance: {source.relevance_score:.2f})")
                 print(f"     URL: {source.url}")
@@ -214,10 +223,14 @@ class DeepResearchCLI:
             print("=" * 50)
     
     def run_research_with_progress(self, query: str, max_results: int = 20, 
-                                 max_level2: int = 10) -> ResearchResult:
+                                 max_level2: int = 10,
+                                 researcher: Optional[DeepResearcher] = None) -> ResearchResult:
         """Run research with a progress indicator"""
-        researcher = DeepResearcher()
-        
+        if researcher is None:
+            # A researcher created here is closed here, releasing its session and workers
+            with DeepResearcher() as researcher:
+                return self.run_research_with_progress(query, max_results, max_level2, researcher)
+
         if self.console:
             with Progress(
                 SpinnerColumn(),
@@ -261,20 +274,21 @@ class DeepResearchCLI:
     
     def save_results_to_json(self, result: ResearchResult, output_path: str):
         """Save research results to JSON file"""
-        import json
-        from dataclasses import asdict
+        def encode_value(value):
+            # Dataclasses and datetimes are serialized by the encoder as it reaches
+            # them, so the result is never deep-copied into dicts by asdict() first
+            if is_dataclass(value) and not isinstance(value, type):
+                return value.__dict__
+            if isinstance(value, datetime):
+                return value.isoformat()
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
         
         try:
-            # Convert dataclass to dict
-            result_dict = asdict(result)
-            
-            # Convert datetime objects to strings
-            result_dict['timestamp'] = result.timestamp.isoformat()
-            for content in result_dict['level_1_content'] + result_dict['level_2_content']:
-                content['scraped_at'] = content['scraped_at'].isoformat() if content['scraped_at'] else None
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(result_dict, f, indent=2, ensure_ascii=False)
+            # The encoder emits many small fragments; a large buffer turns them
+            # into a few big writes without holding the whole document in memory
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                json.dump(result, f, indent=2, ensure_ascii=False,
+                          default=encode_value)
             
             self.print(f"✅ [green]Results saved to JSON:[/green] {output_path}")
             
@@ -286,7 +300,6 @@ class DeepResearchCLI:
         self.print_header()
         
         if args.verbose:
-            import logging
             logging.getLogger().setLevel(logging.INFO)
         
         # Validate query
@@ -303,6 +316,8 @@ class DeepResearchCLI:
             config_table.add_row("Query", args.query)
             config_table.add_row("Max Initial Results", str(args.max_results))
             config_table.add_row("Max Level 2 per Page", str(args.max_level2))
+            config_table.add_row("Concurrent Workers", str(args.max_workers))
+            config_table.add_row("HTTP Cache", args.http_cache or "Off")
             config_table.add_row("Output Directory", args.output_dir)
             config_table.add_row("Generate PDF", "Yes" if args.pdf else "No")
             config_table.add_row("Save JSON", "Yes" if args.json else "No")
@@ -314,18 +329,25 @@ class DeepResearchCLI:
             print(f"  Query: {args.query}")
             print(f"  Max Initial Results: {args.max_results}")
             print(f"  Max Level 2 per Page: {args.max_level2}")
+            print(f"  Concurrent Workers: {args.max_workers}")
+            print(f"  HTTP Cache: {args.http_cache or 'Off'}")
             print(f"  Output Directory: {args.output_dir}")
             print(f"  Generate PDF: {'Yes' if args.pdf else 'No'}")
             print(f"  Save JSON: {'Yes' if args.json else 'No'}")
             print()
         
+        # Share one researcher (and its HTTP connection pool) for the whole run
+        researcher = DeepResearcher(max_workers=args.max_workers, cache_path=args.http_cache)
+        
         try:
             # Create output directory
             Path(args.output_dir).mkdir(parents=True, exist_ok=True)
             
             # Run research
             self.print("🚀 [bold blue]Starting deep research...[/bold blue]\n")
-            result = self.run_research_with_progress(args.query, args.max_results, args.max_level2)
+            result = self.run_research_with_progress(
+                args.query, args.max_results, args.max_level2, researcher=researcher
+            )
             
             # Display results
             self.print("\n✅ [bold green]Research completed![/bold green]\n")
@@ -342,19 +364,17 @@ class DeepResearchCLI:
             # Display sources
             self.print_sources_tree(result, max_sources=args.max_sources)
             
+            # Filename-safe form of the query shared by the PDF and JSON outputs
+            safe_query = safe_query_filename(args.query)
+            
             # Generate PDF if requested
             pdf_path = None
             if args.pdf:
                 self.print("\n📄 [bold blue]Generating PDF report...[/bold blue]")
-                researcher = DeepResearcher()
                 pdf_generator = researcher.pdf_generator
                 
                 # Generate filename
-                import re
-                from datetime import datetime
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_query = re.sub(r'[^a-zA-Z0-9\s]', '', args.query)[:50]
-                safe_query = re.sub(r'\s+', '_', safe_query)
                 pdf_filename = f"deep_research_{safe_query}_{timestamp}.pdf"
                 pdf_path = os.path.join(args.output_dir, pdf_filename)
                 
@@ -367,8 +387,6 @@ class DeepResearchCLI:
             # Save JSON if requested
             if args.json:
                 timestamp = result.timestamp.strftime("%Y%m%d_%H%M%S")
-                safe_query = re.sub(r'[^a-zA-Z0-9\s]', '', args.query)[:50]
-                safe_query = re.sub(r'\s+', '_', safe_query)
                 json_filename = f"deep_research_{safe_query}_{timestamp}.json"
                 json_path = os.path.join(args.output_dir, json_filename)
                 self.save_results_to_json(result, json_path)
@@ -414,9 +432,10 @@ class DeepResearchCLI:
         except Exception as e:
             self.print(f"\n❌ [red]Error during research:[/red] {e}")
             if args.verbose:
-                import traceback
                 self.print(traceback.format_exc())
             return 1
+        finally:
+            researcher.close()
 
 
 def create_parser():
@@ -457,6 +476,20 @@ For more information, visit: https://github.com/yourusername/deep-research
         help="Maximum number of level 2 links to follow per page (default: 10)"
     )
     
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=5,
+        help="Maximum number of pages to crawl concurrently (default: 5)"
+    )
+    
+    parser.add_argument(
+        "--http-cache",
+        type=str,
+        metavar="PATH",
+        help="Cache fetched pages in this SQLite file and reuse them across runs (requires requests-cache)"
+    )
+    
     parser.add_argument(
         "--output-dir",
         type=str,
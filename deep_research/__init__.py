@@ -37,6 +37,7 @@ from .deep_researcher import (
     SearchResult,
     ScrapedContent,
     ResearchResult,
+    safe_query_filename,
 )
 
 # Version information
@@ -59,6 +60,9 @@ __all__ = [
     "ScrapedContent", 
     "ResearchResult",
     
+    # Helpers
+    "safe_query_filename",
+    
     # Metadata
     "__version__",
     "__author__",
@@ -84,8 +88,8 @@ def research(query: str, max_results: int = 20, max_level2: int = 10) -> "Resear
         >>> result = deep_research.research("machine learning trends")
         >>> print(f"Found {len(result.key_findings)} key findings")
     """
-    researcher = DeepResearcher()
-    return researcher.research(query, max_results, max_level2)
+    with DeepResearcher() as researcher:
+        return researcher.research(query, max_results, max_level2)
 
 
 def quick_research(query: str, output_dir: str = "research_output") -> tuple["ResearchResult", str]:
@@ -104,8 +108,8 @@ def quick_research(query: str, output_dir: str = "research_output") -> tuple["Re
         >>> result, pdf_path = deep_research.quick_research("AI ethics")
         >>> print(f"Report saved to: {pdf_path}")
     """
-    researcher = DeepResearcher()
-    return researcher.research_and_generate_pdf(query, output_dir)
+    with DeepResearcher() as researcher:
+        return researcher.research_and_generate_pdf(query, output_dir)
 
 
 # Module-level configuration
@@ -143,27 +147,24 @@ def set_log_level(level: str):
 # Validate dependencies on import
 def _check_dependencies():
     """Check if all required dependencies are available"""
-    missing_deps = []
-    
-    try:
-        import requests
-    except ImportError:
-        missing_deps.append("requests")
+    from .deep_researcher import (
+        BEAUTIFULSOUP_AVAILABLE,
+        DDGS_AVAILABLE,
+        PDF_AVAILABLE,
+        REQUESTS_AVAILABLE,
+    )
     
-    try:
-        import bs4
-    except ImportError:
-        missing_deps.append("beautifulsoup4")
-    
-    try:
-        from duckduckgo_search import DDGS
-    except ImportError:
-        missing_deps.append("duckduckgo-search")
-    
-    try:
-        import reportlab
-    except ImportError:
-        missing_deps.append("reportlab")
+    # Reuse the availability flags set by the crawler module instead of
+    # importing every dependency (reportlab in particular) just to probe for it
+    missing_deps = [
+        name for name, available in (
+            ("requests", REQUESTS_AVAILABLE),
+            ("beautifulsoup4", BEAUTIFULSOUP_AVAILABLE),
+            ("duckduckgo-search", DDGS_AVAILABLE),
+            ("reportlab", PDF_AVAILABLE),
+        )
+        if not available
+    ]
     
     if missing_deps:
         logger.warning(
@@ -1,12 +1,18 @@
-import asyncio
+import heapq
+import itertools
 import logging
 import os
 import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import List, Dict, Any, Set, Optional
-from urllib.parse import urljoin, urlparse
-from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Callable, Iterator, List, Dict, Any, Set, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from dataclasses import dataclass, field, replace
 import json
 
 try:
@@ -23,11 +29,24 @@ except ImportError:
 
 try:
     from bs4 import BeautifulSoup
+    from bs4.dammit import UnicodeDammit
     BEAUTIFULSOUP_AVAILABLE = True
 except ImportError:
     BEAUTIFULSOUP_AVAILABLE = False
     logging.error("beautifulsoup4 library required but not available")
 
+# Optional on-disk HTTP cache; pages are always downloaded when it is missing.
+# Imported on first use so crawls without a cache never pay its import cost.
+REQUESTS_CACHE_AVAILABLE = find_spec("requests_cache") is not None
+
+try:
+    import lxml.etree
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    # Optional C-backed parser; BeautifulSoup is used when it is missing
+    LXML_AVAILABLE = False
+
 try:
     from duckduckgo_search import DDGS
     DDGS_AVAILABLE = True
@@ -35,14 +54,9 @@ except ImportError:
     DDGS_AVAILABLE = False
     logging.error("duckduckgo-search library required but not available")
 
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+# reportlab is only needed for PDF reports, so it is imported by PDFGenerator on first use
+PDF_AVAILABLE = find_spec("reportlab") is not None
+if not PDF_AVAILABLE:
     logging.error("reportlab library required but not available")
 
 # Configure logging
@@ -51,6 +65,79 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Query terms are runs of two or more letters or digits, so "AI" and "5G" count
+_QUERY_TERM_RE = re.compile(r'[^\W_]{2,}')
+
+# Charset declared in a <meta> tag near the top of a document. The attribute run
+# stops at '<' as well as '>' so an unclosed tag cannot make every later
+# '<meta' rescan to the end of the window (quadratic backtracking).
+_META_CHARSET_RE = re.compile(rb'<meta[^<>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+# Sentence boundaries used when extracting key findings
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+# Characters dropped, and whitespace runs replaced, when a query becomes a filename
+_UNSAFE_FILENAME_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def safe_query_filename(query: str) -> str:
+    """Filename-safe form of a query: at most 50 characters, whitespace runs as underscores"""
+    return _WHITESPACE_RE.sub('_', _UNSAFE_FILENAME_RE.sub('', query)[:50])
+
+# Common words that carry no topical signal when matching a query
+_QUERY_STOPWORDS = frozenset({
+    'an', 'as', 'at', 'be', 'by', 'do', 'if', 'in', 'is', 'it', 'me', 'my',
+    'no', 'of', 'on', 'or', 'so', 'to', 'up', 'us', 'we',
+    'about', 'also', 'and', 'any', 'are', 'but', 'can', 'could', 'did', 'does',
+    'for', 'from', 'get', 'has', 'have', 'how', 'into', 'its', 'more', 'most',
+    'not', 'our', 'should', 'some', 'still', 'such', 'than', 'that', 'the',
+    'their', 'them', 'then', 'there', 'these', 'they', 'this', 'those', 'want',
+    'was', 'were', 'what', 'when', 'where', 'which', 'who', 'why', 'will',
+    'with', 'would', 'you', 'your',
+})
+
+def _extract_query_terms(query: str) -> List[str]:
+    """Lowercase, de-duplicated query terms with stopwords removed"""
+    # Queries made only of symbols and single letters ("C++", "C#") keep their raw words
+    tokens = _QUERY_TERM_RE.findall(query.lower()) or query.lower().split()
+    terms = [token for token in tokens if token not in _QUERY_STOPWORDS] or tokens
+    return list(dict.fromkeys(terms))
+
+@lru_cache(maxsize=128)
+def _query_features(query: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """Relevance-scoring terms, 4-letter stems of longer terms, and adjacent-term phrases"""
+    # Scoring keeps the plain whitespace split (stopwords, repeats and punctuation
+    # included) so relevance scores and the min_relevance cut-off are unchanged;
+    # _extract_query_terms is only used to pick key findings
+    terms = [word.lower() for word in query.split() if len(word) > 2]
+    stems = tuple(term[:4] for term in terms if len(term) > 4)
+    phrases = tuple(f"{first} {second}" for first, second in zip(terms, terms[1:]))
+    return tuple(terms), stems, phrases
+
+def _split_http_url(url: str) -> Optional[Tuple[str, str, str]]:
+    """Scheme, netloc and remainder of a plain http(s) URL, or None if it needs urlsplit"""
+    if url.startswith('https://'):
+        scheme, start = 'https', 8
+    elif url.startswith('http://'):
+        scheme, start = 'http', 7
+    else:
+        return None
+    
+    # urlsplit strips these characters and validates bracketed or non-ASCII hosts
+    if '\t' in url or '\n' in url or '\r' in url:
+        return None
+    
+    end = len(url)
+    for separator in '/?#':
+        index = url.find(separator, start, end)
+        if index != -1:
+            end = index
+    
+    netloc = url[start:end]
+    if not netloc or '[' in netloc or not netloc.isascii():
+        return None
+    return scheme, netloc, url[end:]
+
 @dataclass
 class SearchResult:
     """Represents a search result from DuckDuckGo"""
@@ -88,17 +175,82 @@ class ResearchResult:
 class WebCrawler:
     """Robust web crawler for deep research"""
     
-    def __init__(self):
+    # Number of distinct queries whose search results are kept in memory
+    SEARCH_CACHE_SIZE = 256
+    
+    # Requests a single host may receive back to back before the per-host
+    # rate limit (one request per crawl delay) kicks in
+    HOST_BURST = 3
+    
+    # Elements whose text is never page content
+    NON_CONTENT_TAGS = ('script', 'style', 'noscript', 'template')
+    
+    # Links containing any of these are not content pages worth following
+    SKIPPED_LINK_MARKERS = (
+        'javascript:', 'mailto:', '#', '.pdf', '.doc', '.jpg',
+        '.png', '.gif', 'facebook.com', 'twitter.com', 'linkedin.com',
+    )
+    
+    def __init__(self, max_workers: int = 5, max_content_bytes: int = 1_000_000,
+                 pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                 session: Optional["requests.Session"] = None,
+                 cache_path: Optional[str] = None, cache_expire_after: int = 3600,
+                 scrape_cache_size: int = 0):
+        """Create a crawler, building its own HTTP session unless one is passed in
+        
+        A shared session is used exactly as given: it must already carry any
+        retries, headers, connection pool sizing and HTTP cache it needs, so
+        cache_path, pool_connections and pool_maxsize cannot be combined with it.
+        scrape_cache_size opts in to keeping up to that many pages passed to
+        remember_pages() in memory for later runs. cache_expire_after bounds
+        both the HTTP cache and how long those pages are reused, so the HTTP
+        cache gets to revalidate them.
+        """
+        if session is not None and (cache_path or pool_connections is not None or pool_maxsize is not None):
+            raise ValueError("cache_path, pool_connections and pool_maxsize only apply to a session "
+                             "the crawler creates; configure a shared session before passing it in")
+        
         self.logger = logging.getLogger(__name__)
-        self.session = None
+        self.session = session
+        self.cache_path = cache_path
+        self.cache_expire_after = cache_expire_after
+        self.scrape_cache_size = scrape_cache_size
+        # A session passed in by the caller is shared and left open on close()
+        self._owns_session = session is None
+        self.max_workers = max(1, max_workers)
+        self.max_content_bytes = max_content_bytes
+        self.pool_connections = pool_connections if pool_connections is not None else 100
+        self.pool_maxsize = pool_maxsize if pool_maxsize is not None else max(10, self.max_workers)
         self.crawled_urls: Set[str] = set()
+        self._crawled_lock = threading.Lock()
+        self._rate_lock = threading.Lock()
+        self._host_next_slot: Dict[str, float] = {}
+        self._search_cache: "OrderedDict[Tuple[str, int], List[SearchResult]]" = OrderedDict()
+        # Canonical URL -> (monotonic expiry time, links were resolved, scraped page)
+        self._scrape_cache: "OrderedDict[str, Tuple[float, bool, ScrapedContent]]" = OrderedDict()
+        self._ddgs = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         
-        if REQUESTS_AVAILABLE:
+        if REQUESTS_AVAILABLE and self.session is None:
             self._setup_session()
     
     def _setup_session(self):
         """Setup requests session with retries and proper headers"""
-        self.session = requests.Session()
+        if self.cache_path and REQUESTS_CACHE_AVAILABLE:
+            import requests_cache
+            
+            # Fresh hits are replayed from disk; stale entries carrying an
+            # ETag or Last-Modified are revalidated with a conditional GET
+            self.session = requests_cache.CachedSession(
+                self.cache_path,
+                backend='sqlite',
+                expire_after=self.cache_expire_after,
+                filter_fn=self._is_cacheable,
+            )
+        else:
+            if self.cache_path:
+                self.logger.warning("requests-cache not available, HTTP caching disabled")
+            self.session = requests.Session()
         
         # Setup retry strategy
         retry_strategy = Retry(
@@ -107,7 +259,15 @@ class WebCrawler:
             status_forcelist=[429, 500, 502, 503, 504],
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # pool_connections is how many hosts keep a connection pool alive;
+        # level-2 crawls touch many hosts, so urllib3's default of 10 evicts
+        # pools (and their keep-alive sockets) long before the crawl ends.
+        # pool_maxsize bounds the pooled connections kept per host.
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -121,44 +281,159 @@ class WebCrawler:
             'Upgrade-Insecure-Requests': '1',
         })
 
+    def close(self):
+        """Close the underlying HTTP session and release pooled connections"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.session and self._owns_session:
+            self.session.close()
+        self.session = None
+        self._close_ddgs()
+    
+    def reset_crawled_urls(self):
+        """Forget which URLs were crawled so a new run may revisit them; cached pages are kept"""
+        with self._crawled_lock:
+            self.crawled_urls.clear()
+
+    def remember_pages(self, pages: List[ScrapedContent], links_resolved: bool):
+        """Keep pages for reuse by later runs; does nothing unless scrape_cache_size is set"""
+        if self.scrape_cache_size <= 0:
+            return
+        
+        expires_at = time.monotonic() + self.cache_expire_after
+        with self._crawled_lock:
+            for page in pages:
+                crawl_key = self.canonicalize_url(page.url)
+                self._scrape_cache[crawl_key] = (expires_at, links_resolved, replace(page))
+                self._scrape_cache.move_to_end(crawl_key)
+            while len(self._scrape_cache) > self.scrape_cache_size:
+                self._scrape_cache.popitem(last=False)
+
+    def _close_ddgs(self):
+        """Close the persistent DuckDuckGo client, if one was opened"""
+        if self._ddgs is not None:
+            try:
+                self._ddgs.__exit__(None, None, None)
+            except Exception as e:
+                self.logger.debug(f"Error closing DuckDuckGo client: {e}")
+            self._ddgs = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def canonicalize_url(self, url: str) -> str:
+        """Normalize a URL so trivially different spellings dedupe to one key"""
+        # Plain http(s) URLs without tracking parameters are rebuilt by slicing,
+        # which is several times cheaper than urlsplit/urlunsplit per link
+        split = _split_http_url(url)
+        if split is not None:
+            scheme, netloc, rest = split
+            fragment = rest.find('#')
+            if fragment != -1:
+                rest = rest[:fragment]
+            if 'utm_' not in rest and not rest.endswith('?'):
+                if not rest.startswith('/'):
+                    rest = '/' + rest
+                return f"{scheme}://{netloc.lower()}{rest}"
+        
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return url
+        
+        query = parts.query
+        if 'utm_' in query:
+            query = '&'.join(
+                param for param in query.split('&')
+                if not param.lower().startswith('utm_')
+            )
+        
+        return urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or '/',
+            query,
+            '',
+        ))
+
     def search_duckduckgo(self, query: str, max_results: int = 20) -> List[SearchResult]:
         """Search DuckDuckGo for initial results"""
         if not DDGS_AVAILABLE:
             self.logger.error("DuckDuckGo search not available")
             return []
         
+        cache_key = (' '.join(query.lower().split()), max_results)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            self._search_cache.move_to_end(cache_key)
+            self.logger.info(f"Using cached search results for: {query}")
+            return list(cached)
+        
         results = []
         try:
             self.logger.info(f"Searching DuckDuckGo for: {query}")
             
-            with DDGS() as ddgs:
-                search_results = ddgs.text(query, max_results=max_results)
-                
-                for i, result in enumerate(search_results):
-                    search_result = SearchResult(
-                        title=result.get('title', ''),
-                        url=result.get('href', ''),
-                        snippet=result.get('body', ''),
-                        rank=i + 1
-                    )
-                    results.append(search_result)
-                    
+            # Reuse one client so its connection pool survives across searches
+            if self._ddgs is None:
+                self._ddgs = DDGS().__enter__()
+            
+            search_results = self._ddgs.text(query, max_results=max_results)
+            
+            for i, result in enumerate(search_results):
+                search_result = SearchResult(
+                    title=result.get('title', ''),
+                    url=result.get('href', ''),
+                    snippet=result.get('body', ''),
+                    rank=i + 1
+                )
+                results.append(search_result)
+            
             self.logger.info(f"Found {len(results)} search results")
-            return results
+            
+            if results:
+                self._search_cache[cache_key] = results
+                if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+            
+            return list(results)
             
         except Exception as e:
             self.logger.error(f"Error searching DuckDuckGo: {e}")
+            # Start from a fresh client next time in case this one is in a bad state
+            self._close_ddgs()
             return []
 
-    def scrape_url(self, url: str, timeout: int = 10) -> ScrapedContent:
-        """Scrape content from a single URL"""
-        if not REQUESTS_AVAILABLE or not BEAUTIFULSOUP_AVAILABLE:
+    def scrape_url(self, url: str, timeout: int = 10, extract_links: bool = True) -> ScrapedContent:
+        """Scrape content from a single URL, resolving its links unless extract_links is False"""
+        if not REQUESTS_AVAILABLE or not (LXML_AVAILABLE or BEAUTIFULSOUP_AVAILABLE):
             return ScrapedContent(url=url, error="Required libraries not available")
         
-        if url in self.crawled_urls:
-            return ScrapedContent(url=url, error="Already crawled")
+        crawl_key = self.canonicalize_url(url)
+        with self._crawled_lock:
+            if crawl_key in self.crawled_urls:
+                return ScrapedContent(url=url, error="Already crawled")
+            self.crawled_urls.add(crawl_key)
+            
+            # A page kept by an earlier run is reused until it expires, as
+            # long as it carries the links this call needs
+            cached = self._scrape_cache.get(crawl_key)
+            if cached is not None and cached[0] <= time.monotonic():
+                del self._scrape_cache[crawl_key]
+                cached = None
+            if cached is not None and (cached[1] or not extract_links):
+                self._scrape_cache.move_to_end(crawl_key)
+            else:
+                cached = None
         
-        self.crawled_urls.add(url)
+        if cached is not None:
+            self.logger.info(f"Using cached content for: {url}")
+            page = cached[2]
+            return replace(page, url=url, links=list(page.links) if extract_links else [],
+                           relevance_score=0.0)
         
         try:
             self.logger.info(f"Scraping: {url}")
@@ -166,42 +441,25 @@ class WebCrawler:
             if not self.session:
                 return ScrapedContent(url=url, error="Session not available")
             
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extract title
-            title = ""
-            if soup.title and soup.title.string:
-                title = soup.title.string.strip()
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                
+                # Skip binary and oversized documents before downloading the body
+                rejection = self._rejection_reason(response)
+                if rejection:
+                    return ScrapedContent(url=url, error=rejection)
+                
+                if LXML_AVAILABLE:
+                    title, content, hrefs = self._parse_stream_with_lxml(response)
+                else:
+                    title, content, hrefs = self._parse_with_bs4(self._read_capped(response))
             
-            # Extract main content
-            content = soup.get_text()
-            lines = (line.strip() for line in content.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            content = '\n'.join(chunk for chunk in chunks if chunk)
+            # Clean up extracted text: collapse whitespace runs within each line
+            # (spaces, tabs, non-breaking spaces) and drop blank lines
+            content = '\n'.join(filter(None, (' '.join(line.split()) for line in content.splitlines())))
             
             # Extract links
-            links = []
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                absolute_url = urljoin(url, href)
-                
-                # Filter out non-HTTP links and common non-content links
-                if (absolute_url.startswith(('http://', 'https://')) and 
-                    not any(skip in absolute_url.lower() for skip in [
-                        'javascript:', 'mailto:', '#', '.pdf', '.doc', '.jpg', 
-                        '.png', '.gif', 'facebook.com', 'twitter.com', 'linkedin.com'
-                    ])):
-                    links.append(absolute_url)
-            
-            # Remove duplicates
-            links = list(set(links))
+            links = self._resolve_links(url, hrefs) if extract_links else []
             
             return ScrapedContent(
                 url=url,
@@ -218,19 +476,292 @@ class WebCrawler:
             self.logger.warning(f"Error scraping {url}: {e}")
             return ScrapedContent(url=url, error=f"Scraping error: {str(e)}")
 
-    def scrape_multiple_urls(self, urls: List[str], delay: float = 1.0) -> List[ScrapedContent]:
-        """Scrape multiple URLs with delay between requests"""
-        results = []
+    def _rejection_reason(self, response) -> Optional[str]:
+        """Why a response is not worth downloading, judged from its headers alone"""
+        content_type = response.headers.get('Content-Type', '').lower()
+        if content_type and not any(kind in content_type for kind in ('html', 'xml', 'text/')):
+            return f"Unsupported content type: {content_type}"
         
-        for i, url in enumerate(urls):
-            result = self.scrape_url(url)
-            results.append(result)
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > self.max_content_bytes:
+            return f"Response too large: {content_length} bytes"
+        
+        return None
+
+    def _is_cacheable(self, response) -> bool:
+        """Whether the HTTP cache may store a response: a wanted type whose size is known and capped"""
+        # Saving reads the whole body past max_content_bytes, so a response whose
+        # headers do not prove it fits (no Content-Length) is never stored
+        content_length = response.headers.get('Content-Length', '')
+        return content_length.isdigit() and self._rejection_reason(response) is None
+
+    def _resolve_links(self, url: str, hrefs: List[str]) -> List[str]:
+        """Resolve raw hrefs against url into canonical, deduplicated links worth following"""
+        links = []
+        seen_hrefs = set()
+        seen_links = set()
+        base = urlsplit(url)
+        origin = f"{base.scheme}://{base.netloc}"
+        for href in hrefs:
+            # Repeated anchors (nav bars, pagination) resolve to the same URL
+            if href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
+            
+            # Resolve the common href shapes directly; urljoin re-parses the
+            # base URL on every call and is only needed for relative paths
+            if href.startswith(('http://', 'https://')):
+                absolute_url = href
+            elif href.startswith('//'):
+                # Scheme-relative; an empty or odd host is left to urljoin
+                if href[2:3] and href[2:3] not in '/?#' and '/.' not in href:
+                    absolute_url = base.scheme + ':' + href
+                else:
+                    absolute_url = urljoin(url, href)
+            elif href.startswith('/') and '/.' not in href:
+                absolute_url = origin + href
+            else:
+                absolute_url = urljoin(url, href)
             
-            # Add delay between requests to be respectful
-            if i < len(urls) - 1:
-                time.sleep(delay)
+            # Filter out non-HTTP links and common non-content links
+            if not absolute_url.startswith(('http://', 'https://')):
+                continue
+            url_lower = absolute_url.lower()
+            if any(skip in url_lower for skip in self.SKIPPED_LINK_MARKERS):
+                continue
+            
+            # Remove duplicates, keeping document order
+            canonical = self.canonicalize_url(absolute_url)
+            if canonical not in seen_links:
+                seen_links.add(canonical)
+                links.append(canonical)
         
-        return results
+        return links
+
+    def _iter_capped(self, response) -> Iterator[bytes]:
+        """Yield a streamed body in chunks, stopping once max_content_bytes have arrived"""
+        remaining = self.max_content_bytes
+        for chunk in response.iter_content(chunk_size=65536):
+            if len(chunk) >= remaining:
+                self.logger.debug(f"Truncating {response.url} at {self.max_content_bytes} bytes")
+                yield chunk[:remaining]
+                return
+            remaining -= len(chunk)
+            yield chunk
+    
+    def _read_capped(self, response) -> bytes:
+        """Read a streamed body, stopping once max_content_bytes have arrived"""
+        return b''.join(self._iter_capped(response))
+    
+    def _response_encoding(self, response, html: bytes) -> str:
+        """Charset declared by the server or the document, else detected from the first chunk"""
+        if 'charset=' in response.headers.get('Content-Type', '').lower():
+            return response.encoding
+        
+        match = _META_CHARSET_RE.search(html, 0, 2048)
+        if match:
+            return match.group(1).decode('ascii')
+        
+        # Undeclared: valid UTF-8 stays UTF-8, even with a character cut at the chunk end
+        try:
+            html.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError as error:
+            if error.reason == 'unexpected end of data':
+                return 'utf-8'
+        
+        # Otherwise detect it the way the BeautifulSoup path does, falling back
+        # to the Windows-1252 default browsers use for undeclared legacy pages
+        if BEAUTIFULSOUP_AVAILABLE:
+            return UnicodeDammit(html, is_html=True).original_encoding or 'windows-1252'
+        return 'windows-1252'
+    
+    def _parse_stream_with_lxml(self, response) -> Tuple[str, str, List[str]]:
+        """Extract title, raw text and hrefs, parsing with lxml while the body downloads"""
+        chunks = self._iter_capped(response)
+        first_chunk = next(chunks, b'')
+        
+        try:
+            parser = lxml.html.HTMLParser(encoding=self._response_encoding(response, first_chunk))
+        except LookupError:
+            parser = lxml.html.HTMLParser()
+        
+        # Feed chunks as they arrive so parsing overlaps the download
+        parser.feed(first_chunk)
+        for chunk in chunks:
+            parser.feed(chunk)
+        root = parser.close()
+        
+        if root is None:
+            return "", "", []
+        
+        # Remove non-content elements in one C-level pass, keeping their tail text
+        lxml.etree.strip_elements(root, *self.NON_CONTENT_TAGS, with_tail=False)
+        
+        # Collect title and links in a single traversal of the tree
+        title = None
+        hrefs = []
+        for element in root.iter('a', 'title'):
+            if element.tag == 'a':
+                href = element.get('href')
+                if href is not None:
+                    hrefs.append(href)
+            elif title is None:
+                title = element.text_content().strip()
+        
+        return title or "", root.text_content(), hrefs
+    
+    def _parse_with_bs4(self, html: bytes) -> Tuple[str, str, List[str]]:
+        """Extract title, raw text and hrefs using BeautifulSoup"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Remove non-content elements
+        for element in soup(self.NON_CONTENT_TAGS):
+            element.decompose()
+        
+        title = ""
+        if soup.title and soup.title.string:
+            title = soup.title.string.strip()
+        hrefs = [link['href'] for link in soup.find_all('a', href=True)]
+        
+        return title, soup.get_text(), hrefs
+
+    def _reserve_host_slot(self, url: str, delay: float) -> float:
+        """Reserve the next request slot for url's host and return how long to wait for it
+        
+        Each host gets a token bucket refilled at one token per delay seconds
+        and holding up to HOST_BURST tokens, so requests to different hosts
+        never wait on each other and a single host still sees at most one
+        request per delay once its burst is spent.
+        """
+        if delay <= 0:
+            return 0.0
+        
+        split = _split_http_url(url)
+        host = (split[1] if split is not None else urlsplit(url).netloc).lower()
+        burst_window = (self.HOST_BURST - 1) * delay
+        
+        with self._rate_lock:
+            now = time.monotonic()
+            next_slot = self._host_next_slot.get(host, now)
+            start = max(now, next_slot - burst_window)
+            self._host_next_slot[host] = max(next_slot, start) + delay
+        
+        return start - now
+    
+    def _needs_fetch(self, url: str, extract_links: bool) -> bool:
+        """Whether scraping url would go to the network instead of returning a duplicate or cached page"""
+        crawl_key = self.canonicalize_url(url)
+        with self._crawled_lock:
+            if crawl_key in self.crawled_urls:
+                return False
+            cached = self._scrape_cache.get(crawl_key)
+        
+        if cached is not None and cached[0] > time.monotonic() and (cached[1] or not extract_links):
+            return False
+        
+        # Pages in the on-disk HTTP cache are replayed without a new download
+        http_cache = getattr(self.session, 'cache', None)
+        if http_cache is not None and http_cache.contains(url=url):
+            return False
+        return True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the crawler's worker pool, starting it on first use"""
+        # One bounded pool serves every crawl made through this crawler, so
+        # worker threads are reused and concurrency never exceeds max_workers
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawler")
+        return self._executor
+
+    def scrape_multiple_urls(self, urls: List[str], delay: float = 1.0) -> List[ScrapedContent]:
+        """Scrape multiple URLs on a bounded worker pool, preserving input order"""
+        first_level, _ = self.scrape_pipelined(urls, lambda content: [], delay)
+        return first_level
+
+    def scrape_pipelined(self, urls: List[str],
+                         follow: Callable[[ScrapedContent], List[str]],
+                         delay: float = 1.0,
+                         max_followed: int = 100) -> Tuple[List[ScrapedContent], List[ScrapedContent]]:
+        """Scrape URLs and, as each page completes, queue the links follow() picks from it
+        
+        Followed pages are crawled on the same worker pool while the remaining
+        first-level pages are still downloading, so one slow page no longer
+        holds back the whole second level. First-level results keep input
+        order; followed results are returned in completion order. Followed
+        pages are never followed further, so their links are not resolved.
+        
+        Requests wait for their host's rate limit here, in a heap ordered by
+        the time their slot opens, and reach the pool only once it has. Workers
+        never sleep, so a run of same-host links cannot hold every worker while
+        other hosts' pages queue. Duplicates and cached pages skip the wait.
+        """
+        if not urls:
+            return [], []
+        
+        first_level: List[Optional[ScrapedContent]] = [None] * len(urls)
+        second_level: List[ScrapedContent] = []
+        followed: Set[str] = set()
+        
+        executor = self._get_executor()
+        pending = {}
+        # (time the host slot opens, tie-breaker, url, first-level index or None)
+        waiting: List[Tuple[float, int, str, Optional[int]]] = []
+        order = itertools.count()
+        
+        def submit(url: str, index: Optional[int]):
+            future = executor.submit(self.scrape_url, url, extract_links=index is not None)
+            pending[future] = index
+        
+        def schedule(url: str, index: Optional[int]):
+            wait_time = 0.0
+            if self._needs_fetch(url, index is not None):
+                wait_time = self._reserve_host_slot(url, delay)
+            if wait_time > 0:
+                heapq.heappush(waiting, (time.monotonic() + wait_time, next(order), url, index))
+            else:
+                submit(url, index)
+        
+        for index, url in enumerate(urls):
+            schedule(url, index)
+        
+        try:
+            while pending or waiting:
+                # Hand every request whose host slot has opened to the pool
+                now = time.monotonic()
+                while waiting and waiting[0][0] <= now:
+                    _, _, url, index = heapq.heappop(waiting)
+                    submit(url, index)
+                timeout = waiting[0][0] - now if waiting else None
+                
+                if not pending:
+                    time.sleep(timeout)
+                    continue
+                
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    content = future.result()
+                    
+                    if index is None:
+                        second_level.append(content)
+                        continue
+                    
+                    first_level[index] = content
+                    for link in follow(content):
+                        if len(followed) >= max_followed:
+                            break
+                        if link not in followed:
+                            followed.add(link)
+                            schedule(link, None)
+        except BaseException:
+            # Drop queued work so an error or Ctrl+C does not wait for the whole crawl;
+            # only requests already in flight are allowed to finish
+            for future in pending:
+                future.cancel()
+            raise
+        
+        return first_level, second_level
 
 class ContentAnalyzer:
     """Analyzes content for relevance to research query"""
@@ -243,29 +774,22 @@ class ContentAnalyzer:
         if not content or not query:
             return 0.0
         
-        content_lower = content.lower()
-        query_words = [word.lower().strip() for word in query.split() if len(word) > 2]
+        # Query terms, stems and phrases are derived once per query, not per page
+        query_words, stems, phrases = _query_features(query)
         
         if not query_words:
             return 0.0
         
+        content_lower = content.lower()
+        
         # Count exact word matches
         exact_matches = sum(1 for word in query_words if word in content_lower)
         
         # Count partial matches (word stems)
-        partial_matches = 0
-        for word in query_words:
-            if len(word) > 4:
-                stem = word[:4]
-                if stem in content_lower:
-                    partial_matches += 0.5
+        partial_matches = 0.5 * sum(1 for stem in stems if stem in content_lower)
         
         # Calculate phrase matches
-        phrase_matches = 0
-        for i in range(len(query_words) - 1):
-            phrase = f"{query_words[i]} {query_words[i+1]}"
-            if phrase in content_lower:
-                phrase_matches += 2
+        phrase_matches = 2 * sum(1 for phrase in phrases if phrase in content_lower)
         
         total_score = exact_matches + partial_matches + phrase_matches
         max_possible_score = len(query_words) * 2  # Arbitrary scaling
@@ -275,14 +799,22 @@ class ContentAnalyzer:
         return relevance
     
     def filter_relevant_content(self, content_list: List[ScrapedContent], 
-                              query: str, min_relevance: float = 0.1) -> List[ScrapedContent]:
-        """Filter content list to only include relevant items"""
+                              query: str, min_relevance: float = 0.1,
+                              reuse_scores: bool = False) -> List[ScrapedContent]:
+        """Filter content list to only include relevant items
+        
+        With reuse_scores, each item's relevance_score is taken as already
+        calculated for this query instead of being scored again.
+        """
         relevant_content = []
         
         for content in content_list:
             if content.success and content.content:
-                relevance = self.calculate_relevance(content.content, query)
-                content.relevance_score = relevance
+                if reuse_scores:
+                    relevance = content.relevance_score
+                else:
+                    relevance = self.calculate_relevance(content.content, query)
+                    content.relevance_score = relevance
                 
                 if relevance >= min_relevance:
                     relevant_content.append(content)
@@ -295,20 +827,35 @@ class ContentAnalyzer:
 class ReportGenerator:
     """Generates research reports and summaries"""
     
+    # Navigation, headers, footers, etc. that never make a useful finding
+    BOILERPLATE_MARKERS = (
+        'copyright', 'all rights reserved', 'privacy policy', 'terms of service',
+        'navigation', 'menu', 'footer', 'header', 'subscribe', 'login', 'sign up',
+    )
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def generate_summary(self, research_result: ResearchResult) -> str:
-        """Generate a research summary"""
-        query = research_result.query
+    def rank_relevant_content(self, research_result: ResearchResult,
+                              min_relevance: float = 0.1) -> List[ScrapedContent]:
+        """Return successful pages from both crawl levels scoring above min_relevance, most relevant first"""
         total_content = research_result.level_1_content + research_result.level_2_content
-        relevant_content = [c for c in total_content if c.success and c.relevance_score > 0.1]
+        relevant_content = [c for c in total_content if c.success and c.relevance_score > min_relevance]
+        relevant_content.sort(key=lambda x: x.relevance_score, reverse=True)
+        return relevant_content
+    
+    def generate_summary(self, research_result: ResearchResult,
+                         relevant_content: Optional[List[ScrapedContent]] = None) -> str:
+        """Generate a research summary, optionally from an already ranked relevant content list"""
+        query = research_result.query
+        if relevant_content is None:
+            relevant_content = self.rank_relevant_content(research_result)
         
         if not relevant_content:
             return f"No relevant content found for query: {query}"
         
         # Extract key points from most relevant content
-        top_content = sorted(relevant_content, key=lambda x: x.relevance_score, reverse=True)[:5]
+        top_content = relevant_content[:5]
         
         summary_parts = [
             f"Research Summary for: {query}",
@@ -339,31 +886,30 @@ class ReportGenerator:
     
     def _is_meaningful_text(self, text: str) -> bool:
         """Check if text contains meaningful content"""
-        # Skip navigation, headers, footers, etc.
-        skip_patterns = [
-            'copyright', 'all rights reserved', 'privacy policy', 'terms of service',
-            'navigation', 'menu', 'footer', 'header', 'subscribe', 'login', 'sign up'
-        ]
-        
         text_lower = text.lower()
-        return not any(pattern in text_lower for pattern in skip_patterns)
+        return not any(pattern in text_lower for pattern in self.BOILERPLATE_MARKERS)
     
-    def extract_key_findings(self, research_result: ResearchResult) -> List[str]:
-        """Extract key findings from research content"""
-        total_content = research_result.level_1_content + research_result.level_2_content
-        relevant_content = [c for c in total_content if c.success and c.relevance_score > 0.2]
+    def extract_key_findings(self, research_result: ResearchResult,
+                             relevant_content: Optional[List[ScrapedContent]] = None) -> List[str]:
+        """Extract key findings, optionally from an already ranked relevant content list"""
+        if relevant_content is None:
+            relevant_content = self.rank_relevant_content(research_result)
+        relevant_content = [c for c in relevant_content if c.relevance_score > 0.2]
         
         findings = []
-        query_words = research_result.query.lower().split()
+        query_words = _extract_query_terms(research_result.query)
         
         for content in relevant_content[:10]:  # Top 10 most relevant
             # Extract sentences that contain query words
-            sentences = re.split(r'[.!?]+', content.content)
+            sentences = _SENTENCE_SPLIT_RE.split(content.content)
             
             for sentence in sentences:
                 sentence = sentence.strip()
-                if (len(sentence) > 30 and 
-                    any(word in sentence.lower() for word in query_words) and
+                if len(sentence) <= 30:
+                    continue
+                
+                sentence_lower = sentence.lower()
+                if (any(word in sentence_lower for word in query_words) and
                     self._is_meaningful_text(sentence)):
                     
                     findings.append(f"{sentence} (Source: {content.title or content.url})")
@@ -389,6 +935,10 @@ class PDFGenerator:
             return False
         
         try:
+            from reportlab.lib.pagesizes import letter
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            
             # Ensure output directory exists
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
@@ -485,13 +1035,28 @@ class PDFGenerator:
 class DeepResearcher:
     """Main deep research orchestrator"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 5, session: Optional["requests.Session"] = None,
+                 cache_path: Optional[str] = None, cache_expire_after: int = 3600,
+                 scrape_cache_size: int = 0):
+        """Create a researcher; see WebCrawler for the session and cache options"""
         self.logger = logging.getLogger(__name__)
-        self.crawler = WebCrawler()
+        self.crawler = WebCrawler(max_workers=max_workers, session=session, cache_path=cache_path,
+                                  cache_expire_after=cache_expire_after,
+                                  scrape_cache_size=scrape_cache_size)
         self.analyzer = ContentAnalyzer()
         self.report_generator = ReportGenerator()
         self.pdf_generator = PDFGenerator()
     
+    def close(self):
+        """Release network resources held by the crawler"""
+        self.crawler.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def research(self, query: str, max_initial_results: int = 20, 
                 max_level2_per_page: int = 10) -> ResearchResult:
         """Perform comprehensive deep research"""
@@ -501,6 +1066,9 @@ class DeepResearcher:
         # Initialize result
         result = ResearchResult(query=query)
         
+        # Each run crawls afresh; pages kept by earlier runs may come from the scrape cache
+        self.crawler.reset_crawled_urls()
+        
         try:
             # Step 1: Search DuckDuckGo for initial results
             self.logger.info("Step 1: Searching DuckDuckGo...")
@@ -513,51 +1081,50 @@ class DeepResearcher:
             # Step 2: Crawl level 1 pages (initial search results)
             self.logger.info("Step 2: Crawling level 1 pages...")
             level1_urls = [r.url for r in result.initial_results]
-            result.level_1_content = self.crawler.scrape_multiple_urls(level1_urls)
             
-            # Filter for relevant content
-            result.level_1_content = self.analyzer.filter_relevant_content(
-                result.level_1_content, query
+            # Step 3: Follow links from relevant level 1 pages as soon as each one is scraped
+            def follow_links(content: ScrapedContent) -> List[str]:
+                if not (content.success and content.content):
+                    return []
+                # Score every level 1 page here so filtering below can reuse it
+                content.relevance_score = self.analyzer.calculate_relevance(content.content, query)
+                if not content.links or content.relevance_score < 0.1:
+                    return []
+                # Limit links per page
+                return content.links[:max_level2_per_page]
+            
+            # Step 4: Level 2 pages are crawled on the same pool, at most 100 in total
+            self.logger.info("Steps 3-4: Following links from relevant level 1 pages...")
+            level_1_content, level_2_content = self.crawler.scrape_pipelined(
+                level1_urls, follow_links, max_followed=100
             )
+            result.total_links_found = len(level_2_content)
+            self.logger.info(f"Crawled {result.total_links_found} level 2 pages")
             
-            # Step 3: Extract all links from level 1 pages
-            self.logger.info("Step 3: Extracting links from level 1 pages...")
-            all_level2_links = []
-            for content in result.level_1_content:
-                if content.success and content.links:
-                    # Limit links per page
-                    page_links = content.links[:max_level2_per_page]
-                    all_level2_links.extend(page_links)
-            
-            # Remove duplicates and limit total
-            all_level2_links = list(set(all_level2_links))
-            if len(all_level2_links) > 100:  # Reasonable limit
-                all_level2_links = all_level2_links[:100]
-            
-            result.total_links_found = len(all_level2_links)
-            
-            # Step 4: Crawl level 2 pages (links from level 1)
-            if all_level2_links:
-                self.logger.info(f"Step 4: Crawling {len(all_level2_links)} level 2 pages...")
-                result.level_2_content = self.crawler.scrape_multiple_urls(all_level2_links)
-                
-                # Filter for relevant content
-                result.level_2_content = self.analyzer.filter_relevant_content(
-                    result.level_2_content, query
-                )
+            # Filter for relevant content
+            result.level_1_content = self.analyzer.filter_relevant_content(level_1_content, query, reuse_scores=True)
+            result.level_2_content = self.analyzer.filter_relevant_content(level_2_content, query)
+            
+            # Only pages kept for the report are worth reusing in later runs
+            self.crawler.remember_pages(result.level_1_content, links_resolved=True)
+            self.crawler.remember_pages(result.level_2_content, links_resolved=False)
+            
+            # Both levels only hold successful pages once filtered, so the page count
+            # is known here and the summary below can report it
+            result.total_pages_crawled = len(result.level_1_content) + len(result.level_2_content)
             
             # Step 5: Generate summary and key findings
             self.logger.info("Step 5: Generating summary and findings...")
-            result.summary = self.report_generator.generate_summary(result)
-            result.key_findings = self.report_generator.extract_key_findings(result)
+            relevant_content = self.report_generator.rank_relevant_content(result)
+            result.summary = self.report_generator.generate_summary(result, relevant_content)
+            result.key_findings = self.report_generator.extract_key_findings(result, relevant_content)
             
             # Calculate final statistics
-            result.total_pages_crawled = len([c for c in result.level_1_content + result.level_2_content if c.success])
             result.research_time = time.time() - start_time
             
             self.logger.info(f"Research completed in {result.research_time:.1f} seconds")
             self.logger.info(f"Total pages crawled: {result.total_pages_crawled}")
-            self.logger.info(f"Relevant sources found: {len([c for c in result.level_1_content + result.level_2_content if c.relevance_score > 0.1])}")
+            self.logger.info(f"Relevant sources found: {len(relevant_content)}")
             
             return result
             
@@ -573,8 +1140,7 @@ class DeepResearcher:
         
         # Generate PDF
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_query = re.sub(r'[^a-zA-Z0-9\s]', '', query)[:50]
-        safe_query = re.sub(r'\s+', '_', safe_query)
+        safe_query = safe_query_filename(query)
         
         pdf_filename = f"deep_research_{safe_query}_{timestamp}.pdf"
         pdf_path = os.path.join(output_dir, pdf_filename)
@@ -85,6 +85,7 @@ setup(
             "scikit-learn>=1.3.0",
             "selenium>=4.15.0",
             "scrapy>=2.11.0",
+            "requests-cache>=1.0.0",
         ]
     },
     entry_points={
@@ -0,0 +1,143 @@
+"""
+Tests for the crawler's hand-written URL fast paths
+
+Each fast path must agree with the urllib.parse functions it stands in for.
+"""
+
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import pytest
+
+from deep_research.deep_researcher import WebCrawler, _split_http_url
+
+
+def reference_canonical(url: str) -> str:
+    """canonicalize_url computed with urlsplit/urlunsplit only"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    query = parts.query
+    if 'utm_' in query:
+        query = '&'.join(param for param in query.split('&') if not param.lower().startswith('utm_'))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+@pytest.fixture(scope="module")
+def crawler():
+    with WebCrawler() as crawler:
+        yield crawler
+
+
+CANONICAL_CASES = [
+    "http://Example.COM",
+    "https://example.com/",
+    "https://example.com/a/b?q=1",
+    "https://example.com/a#frag",
+    "https://example.com?q=1",
+    "https://example.com#frag",
+    "https://example.com/a?",
+    "https://example.com/a?#",
+    "https://example.com/a#",
+    "https://example.com/?utm_source=x&q=1",
+    "https://example.com/?UTM_Source=x",
+    "https://example.com:8080/path",
+    "https://user:pw@Example.com/path",
+    "https://example.com/a/./b/../c",
+    "https://example.com//double//slash",
+    "https://",
+    "https:////",
+    "http:///path",
+    "https:////host/path",
+    "https://[::1]:8080/path",
+    "https://[::1",
+    "https://exämple.com/path",
+    "https://example.com/pä th",
+    "https://exa\tmple.com/path",
+    "https://example.com/pa\nth",
+    "https://example.com/path\r",
+    "HTTP://Example.com/Path",
+    "ftp://example.com/file",
+    "mailto:someone@example.com",
+    "/relative/path",
+    "",
+]
+
+
+@pytest.mark.parametrize("url", CANONICAL_CASES)
+def test_canonicalize_url_matches_urlsplit(crawler, url):
+    assert crawler.canonicalize_url(url) == reference_canonical(url)
+
+
+@pytest.mark.parametrize("url", CANONICAL_CASES)
+def test_split_http_url_matches_urlsplit(url):
+    split = _split_http_url(url)
+    if split is None:
+        return
+    scheme, netloc, rest = split
+    parts = urlsplit(url)
+    assert (scheme, netloc) == (parts.scheme, parts.netloc)
+    assert url == f"{scheme}://{netloc}{rest}"
+
+
+@pytest.mark.parametrize("url", [
+    "https://",
+    "https:////",
+    "https://[::1]/",
+    "https://exämple.com/",
+    "https://exa\tmple.com/",
+    "https://example.com/\n",
+    "ftp://example.com/",
+])
+def test_split_http_url_defers_unusual_urls(url):
+    assert _split_http_url(url) is None
+
+
+def reference_links(crawler, base: str, href: str):
+    """_resolve_links for a single href computed with urljoin only"""
+    absolute_url = urljoin(base, href)
+    if not absolute_url.startswith(('http://', 'https://')):
+        return []
+    if any(skip in absolute_url.lower() for skip in crawler.SKIPPED_LINK_MARKERS):
+        return []
+    return [crawler.canonicalize_url(absolute_url)]
+
+
+@pytest.mark.parametrize("base", [
+    "https://example.com",
+    "https://example.com/a/b",
+    "http://Example.com:8080/dir/",
+])
+@pytest.mark.parametrize("href", [
+    "/",
+    "/path",
+    "/path?q=1",
+    "/path#frag",
+    "/a/./b",
+    "/a/../b",
+    "/.hidden",
+    "//",
+    "///",
+    "////other.com/z",
+    "//other.com",
+    "//other.com/z?q=1",
+    "//?q",
+    "//#frag",
+    "//other.com/./z",
+    "//[::1]/z",
+    "relative/path",
+    "../up",
+    "?q=1",
+    "https://other.com/x",
+    "http://other.com",
+])
+def test_resolve_links_matches_urljoin(crawler, base, href):
+    assert crawler._resolve_links(base, [href]) == reference_links(crawler, base, href)
+
+
+def test_resolve_links_dedupes_in_document_order(crawler):
+    hrefs = ["/b", "/a", "/b", "/a?", "https://Example.com/a"]
+    assert crawler._resolve_links("https://example.com/", hrefs) == [
+        "https://example.com/b",
+        "https://example.com/a",
+    ]